@@ -1,6 +1,5 @@
 #!/usr/bin/env python3
 import unittest
-from copy import copy, deepcopy
 from threading import Lock
 
 import rospy
@@ -58,18 +57,18 @@ class killtest(unittest.TestCase):
 
     def wait_for_kill_update(self, timeout=rospy.Duration(0.5), ver=None):
         """
-        Wait up to timeout time to an hw-kill alarm change. Returns a copy of the new alarm or throws if times out
+        Wait up to timeout time to an hw-kill alarm change. Returns the new alarms or throws if times out.
+
+        Alarms are only ever reassigned by the callbacks, never mutated in place, so
+        the returned references are safe to use without copying.
         """
         timeout = rospy.Time.now() + timeout
+        rate = rospy.Rate(100)
         while rospy.Time.now() < timeout:
-            lock.acquire()
-            hardware_updated = copy(self.hardware_updated)
-            network_updated = copy(self.network_updated)
-            alarm = (deepcopy(self.hw_kill_alarm), deepcopy(self.network_kill_alarm))
-            lock.release()
-            if hardware_updated or network_updated:
-                return alarm
-            rospy.sleep(0.01)
+            with lock:
+                if self.hardware_updated or self.network_updated:
+                    return (self.hw_kill_alarm, self.network_kill_alarm)
+            rate.sleep()
         raise Exception("timeout")
 
     def assert_raised(self, timeout=rospy.Duration(1)):
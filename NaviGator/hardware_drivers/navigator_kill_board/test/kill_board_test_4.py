@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import unittest
-from copy import copy, deepcopy
-from threading import Lock
+from threading import Condition
 
 import rospy
 from mil_tools import thread_lock
@@ -9,7 +8,7 @@ from navigator_alarm_handlers import NetworkLoss
 from ros_alarms import AlarmBroadcaster, AlarmListener
 from std_msgs.msg import Header
 
-lock = Lock()
+cond = Condition()
 
 
 class killtest(unittest.TestCase):
@@ -24,7 +23,7 @@ class killtest(unittest.TestCase):
         self.network = NetworkLoss()
         super().__init__(*args)
 
-    @thread_lock(lock)
+    @thread_lock(cond)
     def reset_update(self):
         """
         Reset update state to False so we can notice changes to hw-kill
@@ -32,44 +31,46 @@ class killtest(unittest.TestCase):
         self.hardware_updated = False
         self.network_updated = False
 
-    @thread_lock(lock)
     def _hw_kill_cb(self, alarm):
         """
         Called on change in hw-kill alarm.
         If the raised status changed, set update flag to true so test an notice change
         """
-        if self.hw_kill_alarm is None or alarm.raised != self.hw_kill_alarm.raised:
-            self.hardware_updated = True
-        self.hw_kill_alarm = alarm
+        with cond:
+            if self.hw_kill_alarm is None or alarm.raised != self.hw_kill_alarm.raised:
+                self.hardware_updated = True
+            self.hw_kill_alarm = alarm
+            cond.notify_all()
 
-    @thread_lock(lock)
     def _network_kill_cb(self, alarm):
         """
         Called on change in network-kill alarm.
         If the raised status changed, set update flag to true so test an notice change
         """
-        if (
-            self.network_kill_alarm is None
-            or alarm.raised != self.network_kill_alarm.raised
-        ):
-            self.network_updated = True
-        self.network_kill_alarm = alarm
+        with cond:
+            if (
+                self.network_kill_alarm is None
+                or alarm.raised != self.network_kill_alarm.raised
+            ):
+                self.network_updated = True
+            self.network_kill_alarm = alarm
+            cond.notify_all()
 
     def wait_for_kill_update(self, timeout=rospy.Duration(0.5), ver=None):
         """
-        Wait up to timeout time to an hw-kill alarm change. Returns a copy of the new alarm or throws if times out
+        Wait up to timeout time to an hw-kill alarm change. Returns the new alarms or throws if times out.
+
+        Alarms are only ever reassigned by the callbacks, never mutated in place, so
+        the returned references are safe to use without copying.
         """
-        timeout = rospy.Time.now() + timeout
-        while rospy.Time.now() < timeout:
-            lock.acquire()
-            hardware_updated = copy(self.hardware_updated)
-            network_updated = copy(self.network_updated)
-            alarm = (deepcopy(self.hw_kill_alarm), deepcopy(self.network_kill_alarm))
-            lock.release()
-            if hardware_updated or network_updated:
-                return alarm
-            rospy.sleep(0.01)
-        raise Exception("timeout")
+        deadline = rospy.Time.now() + timeout
+        with cond:
+            while not (self.hardware_updated or self.network_updated):
+                remaining = deadline - rospy.Time.now()
+                if remaining <= rospy.Duration(0):
+                    raise Exception("timeout")
+                cond.wait(remaining.to_sec())
+            return (self.hw_kill_alarm, self.network_kill_alarm)
 
     def assert_raised(self, timeout=rospy.Duration(1)):
         """
@@ -97,9 +98,9 @@ class killtest(unittest.TestCase):
         # publishing msg to network
         pub = rospy.Publisher("/network", Header, queue_size=10)
         rate = rospy.Rate(10)
+        h = Header()
         t_end = rospy.Time.now() + rospy.Duration(1)
         while rospy.Time.now() < t_end:
-            h = Header()
             h.stamp = rospy.Time.now()
             pub.publish(h)
             rate.sleep()
@@ -111,7 +112,6 @@ class killtest(unittest.TestCase):
         self.reset_update()
         t_end = rospy.Time.now() + rospy.Duration(1)
         while rospy.Time.now() < t_end:
-            h = Header()
             h.stamp = rospy.Time.now()
             pub.publish(h)
             rate.sleep()
@@ -1,20 +1,41 @@
-from .arm_torpedos import FireTorpedos
-from .autonomous import Autonomous
-from .autonomous_2022 import Autonomous2022
-from .ball_drop import BallDrop
-from .ball_drop_test import BallDropTest
-from .dracula_grab import DraculaGrabber
-from .gripper_test import GripperTest
-from .move import Move
-from .pinger import Pinger
-from .pose_editor import PoseEditor
-from .prequal_mission import PrequalMission
-from .square import Square
-from .start_gate import StartGate
-from .start_gate_2022 import StartGate2022
-from .start_gate_guess import StartGateGuess
-from .strip import Strip
-from .sub_singleton import SubjuGatorMission
-from .surface import Surface
-from .torpedos_test import TorpedosTest
-from .vampire_slayer import VampireSlayer
+from importlib import import_module
+
+# Missions are imported lazily on first access (PEP 562), as each one pulls in
+# numpy/scipy/ROS messages and importing them all up front is slow
+_MODULES = {
+    "FireTorpedos": ".arm_torpedos",
+    "Autonomous": ".autonomous",
+    "Autonomous2022": ".autonomous_2022",
+    "BallDrop": ".ball_drop",
+    "BallDropTest": ".ball_drop_test",
+    "DraculaGrabber": ".dracula_grab",
+    "GripperTest": ".gripper_test",
+    "Move": ".move",
+    "Pinger": ".pinger",
+    "PoseEditor": ".pose_editor",
+    "PrequalMission": ".prequal_mission",
+    "Square": ".square",
+    "StartGate": ".start_gate",
+    "StartGate2022": ".start_gate_2022",
+    "StartGateGuess": ".start_gate_guess",
+    "Strip": ".strip",
+    "SubjuGatorMission": ".sub_singleton",
+    "Surface": ".surface",
+    "TorpedosTest": ".torpedos_test",
+    "VampireSlayer": ".vampire_slayer",
+}
+
+
+def __getattr__(name):
+    if name in _MODULES:
+        module = import_module(_MODULES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    # Listing the lazy names lets inspect.getmembers (used by the mission
+    # server to discover missions) find every mission
+    return sorted(set(globals()) | set(_MODULES))
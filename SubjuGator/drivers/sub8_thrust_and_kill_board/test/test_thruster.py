@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+import unittest
+
+import numpy as np
+from sub8_thrust_and_kill_board.thruster import make_thruster_dictionary
+
+# Forward and backward calibrations deliberately differ in degree
+LAYOUT = {
+    "FLH": {
+        "node_id": 0,
+        "calib": {"forward": [0.1, -0.2, 0.3, 0.01], "backward": [0.2, 0.02]},
+    },
+    "FRH": {
+        "node_id": 1,
+        "calib": {"forward": [0.05, 0.0], "backward": [-0.01, 0.2, 0.1]},
+    },
+}
+
+
+class TestThrusterDictionary(unittest.TestCase):
+    def test_evaluate_all_matches_effort_from_thrust(self):
+        """Test vectorized efforts match each thruster's own effort, for mixed signs"""
+        thrusters, _ = make_thruster_dictionary(LAYOUT)
+        for a in np.linspace(-5.0, 5.0, 21):
+            for b in (-3.0, -0.5, 0.0, 0.5, 3.0):
+                thrusts = np.array([a, b])
+                expected = [
+                    thrusters[name].effort_from_thrust(thrust)
+                    for name, thrust in zip(thrusters.names, thrusts)
+                ]
+                np.testing.assert_allclose(
+                    thrusters.evaluate_all(thrusts),
+                    expected,
+                    err_msg=f"evaluate_all differs for thrusts {thrusts}",
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,4 +9,4 @@ from .packets import (
     ThrustSetPacket,
 )
 from .simulation import ThrusterAndKillBoardSimulation
-from .thruster import Thruster
+from .thruster import Thruster, ThrusterDictionary
@@ -1,16 +1,66 @@
-from typing import Any, Dict
+from __future__ import annotations
 
-from numpy import clip, polyval
+from typing import Any
 
+import numpy as np
 
-def make_thruster_dictionary(dictionary):
+
+def make_thruster_dictionary(dictionary) -> ThrusterDictionary:
     """
     Make a dictionary mapping thruster names to :class:`Thruster` objects.
     """
     ret = {}
     for thruster, content in dictionary.items():
         ret[thruster] = Thruster.from_dict(content)
-    return ret
+    return ThrusterDictionary(ret)
+
+
+class ThrusterDictionary(dict):
+    """
+    Dictionary mapping thruster names to :class:`Thruster` objects, which can
+    also evaluate the efforts of every thruster in a single vectorized pass.
+
+    Attributes:
+        names (List[str]): The thruster names, in the order used by :meth:`evaluate_all`.
+        fwd_coefs (numpy.ndarray): ``(N, deg + 1)`` forward calibration coefficients,
+            zero-padded at the front to the highest degree of any calibration.
+        bwd_coefs (numpy.ndarray): ``(N, deg + 1)`` backward calibration coefficients,
+            zero-padded at the front to the same width as ``fwd_coefs``.
+    """
+
+    def __init__(self, thrusters: dict[str, Thruster]):
+        super().__init__(thrusters)
+        self.names = list(thrusters.keys())
+        forward = [thrusters[name].forward_calibration for name in self.names]
+        backward = [thrusters[name].backward_calibration for name in self.names]
+        # Both directions share one width so they can be selected between per thruster
+        width = max((len(c) for c in forward + backward), default=1)
+        self.fwd_coefs = self._stack(forward, width)
+        self.bwd_coefs = self._stack(backward, width)
+
+    @staticmethod
+    def _stack(calibrations, width: int) -> np.ndarray:
+        coefs = np.zeros((len(calibrations), width))
+        for i, c in enumerate(calibrations):
+            coefs[i, width - len(c) :] = c
+        return coefs
+
+    def evaluate_all(self, thrusts: np.ndarray) -> np.ndarray:
+        """
+        Finds the clipped effort for every thruster at once.
+
+        Args:
+            thrusts (numpy.ndarray): The thrust for each thruster, ordered as :attr:`names`.
+
+        Returns:
+            numpy.ndarray: The effort for each thruster, in the same order.
+        """
+        thrusts = np.asarray(thrusts, dtype=float)
+        coefs = np.where((thrusts < 0)[:, None], self.bwd_coefs, self.fwd_coefs)
+        y = np.zeros_like(thrusts)
+        for k in range(coefs.shape[1]):
+            y = y * thrusts + coefs[:, k]
+        return np.clip(y, -0.58, 0.58, out=y)
 
 
 class Thruster:
@@ -25,9 +75,12 @@ class Thruster:
     def __init__(self, forward_calibration, backward_calibration):
         self.forward_calibration = forward_calibration
         self.backward_calibration = backward_calibration
+        # Plain float tuples let the per-tick evaluation skip NumPy dispatch
+        self._fwd = tuple(float(c) for c in forward_calibration)
+        self._bwd = tuple(float(c) for c in backward_calibration)
 
     @classmethod
-    def from_dict(cls, data: Dict[str, Dict[str, Any]]):
+    def from_dict(cls, data: dict[str, dict[str, Any]]):
         """
         Constructs the class from a dictionary. The dictionary should be formatted
         as so:
@@ -49,10 +102,12 @@ class Thruster:
         return cls(forward_calibration, backward_calibration)
 
     def effort_from_thrust_unclipped(self, thrust: Any):
-        if thrust < 0:
-            return polyval(self.backward_calibration, thrust)
-        else:
-            return polyval(self.forward_calibration, thrust)
+        coeffs = self._bwd if thrust < 0 else self._fwd
+        # Horner's method, equivalent to numpy.polyval for a scalar thrust
+        y = 0.0
+        for c in coeffs:
+            y = y * thrust + c
+        return y
 
     def effort_from_thrust(self, thrust: Any):
         """
@@ -63,4 +118,8 @@ class Thruster:
         """
         unclipped = self.effort_from_thrust_unclipped(thrust)
         # Theoretically can limit to .66 under 16V assumptions or .5 under 12V assumptions... So do both (.5 + 66)/2
-        return clip(unclipped, -0.58, 0.58)
+        if unclipped < -0.58:
+            return -0.58
+        if unclipped > 0.58:
+            return 0.58
+        return unclipped
@@ -3,7 +3,6 @@ import pickle
 import matplotlib.pyplot as plt
 import numpy as np
 import sklearn.svm
-from scipy.ndimage import convolve
 from sklearn import linear_model, metrics
 from sklearn.cross_validation import train_test_split
 from sklearn.neural_network import BernoulliRBM
@@ -32,21 +31,20 @@ def nudge_dataset(X, Y):
     This produces a dataset 5 times bigger than the original one,
     by moving the 8x8 images in X around by 1px to left, right, down, up
     """
-    direction_vectors = [
-        [[0, 1, 0], [0, 0, 0], [0, 0, 0]],
-        [[0, 0, 0], [1, 0, 0], [0, 0, 0]],
-        [[0, 0, 0], [0, 0, 1], [0, 0, 0]],
-        [[0, 0, 0], [0, 0, 0], [0, 1, 0]],
-    ]
-
-    def shift(x, w):
-        return convolve(x.reshape((8, 8)), mode="constant", weights=w).ravel()
-
-    X = np.concatenate(
-        [X]
-        + [np.apply_along_axis(shift, 1, X, vector) for vector in direction_vectors],
-    )
-    Y = np.concatenate([Y for _ in range(5)], axis=0)
+    N = X.shape[0]
+    Xi = X.reshape((-1, 8, 8))
+    # Fill the shifted copies straight into one float32 buffer (the RBM works
+    # in float32 anyway), with zeros left along the edges they were shifted from
+    out = np.zeros((5 * N, 64), dtype=np.float32)
+    out[:N] = X
+    shifted = out[N:].reshape((4, N, 8, 8))
+    shifted[0, :, :-1, :] = Xi[:, 1:, :]  # up
+    shifted[1, :, :, :-1] = Xi[:, :, 1:]  # left
+    shifted[2, :, :, 1:] = Xi[:, :, :-1]  # right
+    shifted[3, :, 1:, :] = Xi[:, :-1, :]  # down
+
+    X = out
+    Y = np.tile(Y, 5).astype(np.int8)
     return X, Y
 
 
@@ -62,8 +60,15 @@ print(np.sum(Y == 0))
 print(np.sum(Y == 1))
 
 # X = np.asarray(digits.data, 'float32')
+# Each column of the nudged dataset holds that pixel and its shifted neighbours
+# (or zeros at the edges), so its min/max are found by nudging the original
+# per-column min/max instead of reducing over the 5x larger nudged dataset
+extremes, _ = nudge_dataset(np.stack([np.min(X, 0), np.max(X, 0)]), np.zeros(2))
+mn = np.min(extremes[0::2], 0)
+mx = np.max(extremes[1::2], 0) + 0.0001
 X, Y = nudge_dataset(X, Y)
-X = (X - np.min(X, 0)) / (np.max(X, 0) + 0.0001)  # 0-1 scaling
+X -= mn  # 0-1 scaling
+X /= mx
 
 X_train, X_test, Y_train, Y_test = train_test_split(X, Y, test_size=0.2, random_state=0)
 
@@ -14,10 +14,15 @@ Each project contains n datasets. Each dataset has a list of bags (sources) to g
 """
 
 import argparse
+import hashlib
 import os
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from typing import Optional
 
 import cv2
+import numpy as np
 import rosbag
 import rospy
 import yaml
@@ -41,6 +46,14 @@ class BagImageExtractorSource:
     RECT_COLOR = "rect_color"
     RAW = "raw"
 
+    #: Number of background threads encoding and writing images to disk
+    WRITER_THREADS = 2
+    #: Max images waiting to be written before extraction blocks
+    WRITE_QUEUE_SIZE = 32
+    #: zlib level (0-9) used when encoding PNGs. Low levels encode much faster
+    #: at the cost of slightly larger files
+    PNG_COMPRESSION = 1
+
     def __init__(
         self,
         filename: str,
@@ -77,6 +90,9 @@ class BagImageExtractorSource:
         self.freq = freq
         self.encoding = self.get_image_proc_flags_from_encoding(encoding)
         self.image_set = ImageSet()
+        self._last_hash = None
+        self._write_queue = None
+        self._write_error = None
 
     @classmethod
     def get_image_proc_flags_from_encoding(cls, encoding):
@@ -160,7 +176,7 @@ class BagImageExtractorSource:
         model.fromCameraInfo(msg)
         return model
 
-    def _save_img(self, msg, time, image_dir, prefix=""):
+    def _save_img(self, msg, time, path_prefix):
         """Save the image msg to the image directory, named with the time object
         converted to a string. Uses mil image proc to rectify / convert color as
         configured (see __init__)
@@ -168,8 +184,8 @@ class BagImageExtractorSource:
         Args:
           msg:
           time:
-          image_dir:
-          prefix:  (Default value = "")
+          path_prefix: image directory joined with the filename prefix,
+            to which the stamp and extension are appended.
 
         Returns:
 
@@ -189,16 +205,69 @@ class BagImageExtractorSource:
         if self.encoding == ImageProc.RAW:
             img = cv2.cvtColor(img, cv2.COLOR_RGB2BGR)
 
-        # If color, convert to bgr
+        # If color, convert to bgr (unless it already is, to avoid a full image copy)
         if self.encoding == ImageProc.COLOR or self.encoding == ImageProc.RECT_COLOR:
-            img = cvtColor2(img, self.image_set.color_encoding, "bgr8")
+            color_encoding = self.image_set.color_encoding
+            if color_encoding != "bgr8":
+                img = cvtColor2(img, color_encoding, "bgr8")
 
         # Uncomment this is bag is recorded in BGR format so images don't appear inverted
         # img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-        filename = os.path.join(image_dir, prefix + str(msg.header.stamp) + ".png")
-        cv2.imwrite(filename, img)
 
-    def extract_images(self, source_dir=".", image_dir=".", verbose=False):
+        # Skip the (expensive) encode and write if the frame is identical to the last one saved.
+        # Hashing the buffer directly avoids copying images that are already contiguous
+        img_hash = hashlib.blake2b(
+            memoryview(np.ascontiguousarray(img)),
+            digest_size=8,
+        ).digest()
+        if img_hash == self._last_hash:
+            return
+        self._last_hash = img_hash
+        stamp = msg.header.stamp
+        # Exactly str(stamp) (the stamp in nanoseconds), without going through Time.__str__
+        filename = f"{path_prefix}{stamp.secs * 1000000000 + stamp.nsecs}.png"
+        # Rectified images are written in place into buffers ImageProc reuses for
+        # the next frame, so the writer threads need their own copy of those.
+        # Every other image is freshly allocated for each message.
+        if img is self.image_set.rect or img is self.image_set.rect_color:
+            img = img.copy()
+        self._write_queue.put((filename, img))
+
+    def _write_images(self):
+        """Encode and write images from the write queue until a ``None``
+        sentinel is received. Run in background threads by extract_images,
+        as OpenCV releases the GIL while encoding.
+
+        The first error is recorded for extract_images to raise, and the queue
+        keeps being drained so that the extracting thread never blocks on it.
+        """
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                break
+            if self._write_error is not None:
+                continue
+            filename, img = item
+            try:
+                ok, buf = cv2.imencode(
+                    ".png",
+                    img,
+                    [cv2.IMWRITE_PNG_COMPRESSION, self.PNG_COMPRESSION],
+                )
+                if not ok:
+                    raise Exception(f"failed to encode image {filename}")
+                with open(filename, "wb") as f:
+                    f.write(buf.tobytes())
+            except Exception as e:
+                self._write_error = e
+
+    def extract_images(
+        self,
+        source_dir=".",
+        image_dir=".",
+        verbose=False,
+        camera_cache=None,
+    ):
         """Extract the images using the configuration from __init__, resolving the bag file
         relative to source_dir and placing extracted images into image_dir.
 
@@ -206,6 +275,9 @@ class BagImageExtractorSource:
           source_dir:  (Default value = ".")
           image_dir:  (Default value = ".")
           verbose:  (Default value = False)
+          camera_cache: optional dict shared between sources, mapping
+            (bag filename, camera namespace) to its PinholeCameraModel so the
+            model is only built once per camera. (Default value = None)
 
         Returns:
 
@@ -217,23 +289,60 @@ class BagImageExtractorSource:
         filename = os.path.join(source_dir, self.filename)
         b = rosbag.Bag(filename)
         if self.encoding != 0:
-            self.camera_model = self.get_camera_model(b, self.topic)
+            if camera_cache is None:
+                camera_cache = {}
+            key = (filename, self.topic.rsplit("/", 1)[0])
+            if key not in camera_cache:
+                camera_cache[key] = self.get_camera_model(b, self.topic)
+            self.camera_model = camera_cache[key]
         else:
             self.camera_model = None
-        _, _, first_time = next(b.read_messages())
-        start = first_time + rospy.Duration(self.start) if self.start else first_time
+        first_time = rospy.Time.from_sec(b.get_start_time())
+        # The start time read as a float can land just after the first message,
+        # so only bound the read by it when an offset was actually requested
+        start = first_time + rospy.Duration(self.start) if self.start else None
         stop = first_time + rospy.Duration(self.stop) if self.stop else None
-        interval = rospy.Duration(1.0 / self.freq) if self.freq else rospy.Duration(0)
-        next_time = start
+        # Decimation is done in integer nanoseconds to avoid allocating
+        # Time / Duration objects for every message
+        interval_ns = int(1e9 / self.freq) if self.freq else 0
+        next_ns = start.to_nsec() if start is not None else 0
         prefix = slugify(str(self.filename)) + "_" + slugify(str(self.topic))
-        for _, msg, time in b.read_messages(
-            topics=self.topic,
-            start_time=start,
-            end_time=stop,
-        ):
-            if time >= next_time:
-                next_time = time + interval
-                self._save_img(msg, time, image_dir, prefix=prefix)
+        path_prefix = os.path.join(image_dir, prefix)
+        self._last_hash = None
+        self._write_queue = queue.Queue(maxsize=self.WRITE_QUEUE_SIZE)
+        self._write_error = None
+        writers = [
+            threading.Thread(target=self._write_images, daemon=True)
+            for _ in range(self.WRITER_THREADS)
+        ]
+        for writer in writers:
+            writer.start()
+        try:
+            # Read raw messages so only the ones due to be saved are deserialized
+            for _, raw_msg, time in b.read_messages(
+                topics=self.topic,
+                start_time=start,
+                end_time=stop,
+                raw=True,
+            ):
+                if self._write_error is not None:
+                    break
+                time_ns = time.to_nsec()
+                if time_ns < next_ns:
+                    continue
+                _, data, _, _, msg_type = raw_msg
+                msg = msg_type()
+                msg.deserialize(data)
+                next_ns = time_ns + interval_ns
+                self._save_img(msg, time, path_prefix)
+        finally:
+            for _ in writers:
+                self._write_queue.put(None)
+            for writer in writers:
+                writer.join()
+            self._write_queue = None
+        if self._write_error is not None:
+            raise self._write_error
 
 
 class BagImageExtractorDatasets:
@@ -287,6 +396,23 @@ class BagImageExtractorDatasets:
             sources.append(BagImageExtractorSource.from_dict(source))
         return cls(d["name"], sources)
 
+    def make_image_dir(self, image_dir="."):
+        """Create the directory within image_dir that this dataset's images
+        will be extracted into, if it does not already exist.
+
+        Args:
+          image_dir:  (Default value = ".")
+
+        Returns:
+          The path to the dataset's image directory.
+        """
+        image_dir = os.path.join(image_dir, self.name)
+        if not os.path.isdir(image_dir):
+            if os.path.exists(image_dir):
+                raise Exception(f"{image_dir} exists but is not a directory")
+            os.makedirs(image_dir)
+        return image_dir
+
     def extract_images(self, source_dir=".", image_dir=".", verbose=False):
         """Extract images from each source bag in this dataset into a single
         directory.
@@ -305,16 +431,14 @@ class BagImageExtractorDatasets:
         """
         if verbose:
             print(f"Producing dataset '{self.name}'")
-        image_dir = os.path.join(image_dir, self.name)
-        if not os.path.isdir(image_dir):
-            if os.path.exists(image_dir):
-                raise Exception(f"{image_dir} exists but is not a directory")
-            os.makedirs(image_dir)
+        image_dir = self.make_image_dir(image_dir)
+        camera_cache = {}
         for source in self.sources:
             source.extract_images(
                 source_dir=source_dir,
                 image_dir=image_dir,
                 verbose=verbose,
+                camera_cache=camera_cache,
             )
 
 
@@ -367,7 +491,8 @@ class BagImageExtractorProject:
         )
 
     def extract_images(self, verbose=False):
-        """
+        """Extract images from every source of every dataset. Each source bag
+        is independent, so sources are extracted in parallel worker processes.
 
         Args:
           verbose:  (Default value = False)
@@ -375,14 +500,49 @@ class BagImageExtractorProject:
         Returns:
 
         """
+        tasks = []
         for dataset in self.datasets:
-            dataset.extract_images(
-                source_dir=self.source_dir,
-                image_dir=self.image_dir,
-                verbose=verbose,
+            if verbose:
+                print(f"Producing dataset '{dataset.name}'")
+            image_dir = dataset.make_image_dir(self.image_dir)
+            tasks.extend((source, image_dir) for source in dataset.sources)
+        n = len(tasks)
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            list(
+                executor.map(
+                    _extract_one,
+                    tasks,
+                    [self.source_dir] * n,
+                    [verbose] * n,
+                ),
             )
 
 
+# Camera models built by this (worker) process, shared by all sources it extracts
+_camera_cache = {}
+
+
+def _extract_one(task, source_dir, verbose):
+    """Extract the images of a single (source, image_dir) task. Defined at
+    module level so it can be pickled for a worker process.
+
+    Args:
+      task:
+      source_dir:
+      verbose:
+
+    Returns:
+
+    """
+    source, image_dir = task
+    source.extract_images(
+        source_dir=source_dir,
+        image_dir=image_dir,
+        verbose=verbose,
+        camera_cache=_camera_cache,
+    )
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
         description="Extracts images from ROS bags into image files according to a configuration.\n\